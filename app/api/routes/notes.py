@@ -7,6 +7,7 @@ from app.core.config import settings
 from app.db.provider import get_db
 from app.services.factory import get_note_service, get_category_service, get_categorization_service, get_note_analysis_service
 from app.schemas.note import NoteCreate, NoteUpdate, NoteResponse, NoteSearchQuery, NoteMongoResponse
+from app.dependencies import enhance_note_with_categories
 
 # Get services
 note_service = get_note_service()
@@ -17,17 +18,33 @@ note_analysis_service = get_note_analysis_service()
 # Create router
 router = APIRouter()
 
+def validate_page_cursor(skip: int, after_id: Optional[str]) -> None:
+    """Validate the after_id page cursor, which replaces skip rather than adding to it"""
+    if after_id is None:
+        return
+    try:
+        ObjectId(after_id)
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="Invalid MongoDB ID format")
+    if skip:
+        raise HTTPException(status_code=400, detail="skip cannot be combined with after_id")
+
 @router.get("/", response_model=List[NoteMongoResponse])
 async def get_notes(
     skip: int = 0, 
     limit: int = 100,
+    after_id: Optional[str] = None,
     db = Depends(get_db())
 ):
-    """Get all notes with pagination"""
-    notes = note_service.get_notes(db, skip=skip, limit=limit)
+    """Get all notes with pagination
+    
+    Pass the id of the last note of the previous page as after_id to page
+    without skip.
+    """
+    validate_page_cursor(skip, after_id)
+    notes = note_service.get_notes(db, skip=skip, limit=limit, after_id=after_id)
     
     # Enhance each note with categories
-    from app.dependencies import enhance_note_with_categories
     enhanced_notes = [enhance_note_with_categories(note, db) for note in notes]
     
     return enhanced_notes
@@ -41,7 +58,6 @@ async def create_note(
     note = note_service.create_note(db, note_in=note_in)
     
     # Enhance note with categories
-    from app.dependencies import enhance_note_with_categories
     enhanced_note = enhance_note_with_categories(note, db)
     
     return enhanced_note
@@ -63,7 +79,6 @@ async def get_note(
         raise HTTPException(status_code=404, detail="Note not found")
     
     # Enhance note with categories
-    from app.dependencies import enhance_note_with_categories
     enhanced_note = enhance_note_with_categories(note, db)
     
     return enhanced_note
@@ -86,7 +101,6 @@ async def update_note(
         raise HTTPException(status_code=404, detail="Note not found")
     
     # Enhance note with categories
-    from app.dependencies import enhance_note_with_categories
     enhanced_note = enhance_note_with_categories(note, db)
     
     return enhanced_note
@@ -108,7 +122,6 @@ async def delete_note(
         raise HTTPException(status_code=404, detail="Note not found")
     
     # Enhance note with categories
-    from app.dependencies import enhance_note_with_categories
     enhanced_note = enhance_note_with_categories(note, db)
     
     return enhanced_note
@@ -118,13 +131,14 @@ async def search_notes(
     query: NoteSearchQuery,
     skip: int = 0, 
     limit: int = 100,
+    after_id: Optional[str] = None,
     db = Depends(get_db())
 ):
     """Search notes by various criteria"""
-    notes = note_service.search_notes(db, query=query, skip=skip, limit=limit)
+    validate_page_cursor(skip, after_id)
+    notes = note_service.search_notes(db, query=query, skip=skip, limit=limit, after_id=after_id)
     
     # Enhance each note with categories
-    from app.dependencies import enhance_note_with_categories
     enhanced_notes = [enhance_note_with_categories(note, db) for note in notes]
     
     return enhanced_notes
@@ -1,5 +1,54 @@
 from app.db.mongodb import get_database
 from datetime import datetime
+from pymongo import IndexModel, TEXT
+
+# Desired indexes per collection
+NOTES_INDEXES = [
+    IndexModel("title"),
+    IndexModel("category_ids"),
+    IndexModel([("title", TEXT), ("content", TEXT)], name="notes_text_search"),
+]
+CATEGORIES_INDEXES = [
+    IndexModel("name", unique=True),
+]
+
+def missing_indexes(collection, index_models):
+    """Return the index models not yet present on the collection, by name or key pattern"""
+    existing_indexes = collection.index_information()
+    existing_keys = {tuple(info.get("key", [])) for info in existing_indexes.values()}
+    # Text indexes are stored with an _fts/_ftsx key and a collection allows only one,
+    # so any existing text index satisfies a wanted one whatever its name
+    has_text_index = any(key[0] == "_fts" for keys in existing_keys for key in keys)
+    missing = []
+    for model in index_models:
+        spec = model.document
+        is_text_index = TEXT in spec["key"].values()
+        if (spec["name"] in existing_indexes or tuple(spec["key"].items()) in existing_keys
+                or (is_text_index and has_text_index)):
+            print(f"Index {spec['name']} already exists, skipping...")
+            continue
+        missing.append(model)
+    return missing
+
+def ensure_indexes(collection, index_models):
+    """Create the missing indexes in a single batched call"""
+    missing = missing_indexes(collection, index_models)
+    if not missing:
+        return
+    names = [model.document["name"] for model in missing]
+    print(f"Creating indexes {', '.join(names)}...")
+    try:
+        collection.create_indexes(missing)
+        return
+    except Exception as e:
+        print(f"Error creating indexes {', '.join(names)}: {e}, retrying one at a time")
+    # createIndexes is all-or-nothing, so retry each index alone to keep one bad
+    # index from blocking the rest
+    for model in missing:
+        try:
+            collection.create_indexes([model])
+        except Exception as e:
+            print(f"Error creating index {model.document['name']}: {e}")
 
 def init_mongodb():
     """Initialize MongoDB collections with indexes"""
@@ -11,54 +60,9 @@ def init_mongodb():
     
     if "categories" not in db.list_collection_names():
         db.create_collection("categories")
-    # Create indexes if they don't exist
-    def ensure_index(collection, index_key, **kwargs):
-        """Create index if it doesn't exist already"""
-        existing_indexes = collection.index_information()
-        
-        # Convert index_key to string for comparison
-        if isinstance(index_key, list):
-            index_name = "_".join([f"{k}_1" for k in index_key])
-        else:
-            index_name = f"{index_key}_1"
-            
-        # Check if name was specified
-        if "name" in kwargs:
-            index_name = kwargs["name"]
-        
-        # Better check for existing indexes by looking at their key patterns
-        index_exists = False
-        for idx_name, idx_info in existing_indexes.items():
-            # Check if the key pattern matches
-            key_pattern = idx_info.get('key', [])
-            if key_pattern:
-                if isinstance(index_key, list):
-                    # For compound indexes
-                    is_match = all(any(k[0] == field for k in key_pattern) for field in index_key)
-                else:
-                    # For single field indexes
-                    is_match = any(k[0] == index_key for k in key_pattern)
-                
-                if is_match:
-                    index_exists = True
-                    print(f"Index on {index_key} already exists as {idx_name}, skipping...")
-                    break
-        
-        if not index_exists:
-            print(f"Creating index {index_name}...")
-            try:
-                collection.create_index(index_key, **kwargs)
-            except Exception as e:
-                print(f"Error creating index {index_name}: {e}")
-    
-    # Notes collection indexes
-    ensure_index(db.notes, "created_at")
-    ensure_index(db.notes, "title")
-    ensure_index(db.notes, "category_ids")
-    
-    # Categories collection indexes
-    ensure_index(db.categories, "name", unique=True)
-    ensure_index(db.categories, "created_at")
+    # Create missing indexes, one createIndexes command per collection
+    ensure_indexes(db.notes, NOTES_INDEXES)
+    ensure_indexes(db.categories, CATEGORIES_INDEXES)
     
     print("MongoDB collections and indexes created successfully")
     
@@ -1,5 +1,7 @@
 from typing import List, Optional, Dict, Any, TypeVar, Generic, Type
+from datetime import datetime
 from bson.objectid import ObjectId
+from pymongo import ReturnDocument
 from app.db.mongodb import get_collection, serialize_id, prepare_for_mongo
 
 T = TypeVar('T')
@@ -14,33 +16,46 @@ class BaseMongoRepository(Generic[T]):
     def collection(self):
         return get_collection(self.collection_name)
     
-    def get_multi(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    def get_multi(self, skip: int = 0, limit: int = 100, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all items with pagination"""
-        cursor = self.collection.find().sort("created_at", -1).skip(skip).limit(limit)
-        return [serialize_id(item) for item in cursor]
+        return self.get_by_filter({}, skip=skip, limit=limit, after_id=after_id)
     
     def get(self, id: str) -> Optional[Dict[str, Any]]:
         """Get item by ID"""
         item = self.collection.find_one({"_id": ObjectId(id)})
         return serialize_id(item) if item else None
     
-    def get_by_filter(self, filter_dict: Dict[str, Any], skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-        """Find items matching filter criteria"""
-        cursor = self.collection.find(filter_dict).sort("created_at", -1).skip(skip).limit(limit)
+    def get_by_filter(self, filter_dict: Dict[str, Any], skip: int = 0, limit: int = 100, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Find items matching filter criteria, newest first by _id"""
+        if after_id and skip:
+            raise ValueError("skip cannot be combined with after_id")
+        if after_id:
+            filter_dict = {**filter_dict, "_id": {"$lt": ObjectId(after_id)}}
+        cursor = self.collection.find(filter_dict).sort("_id", -1)
+        if skip:
+            cursor = cursor.skip(skip)
+        # Fetch the whole page in the first batch rather than the server default of 101;
+        # batch_size rejects negative values and 0 leaves the cursor unlimited
+        if limit > 0:
+            cursor = cursor.batch_size(limit)
+        cursor = cursor.limit(limit)
         return [serialize_id(item) for item in cursor]
     
     def create(self, obj_in: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new item"""
         obj_data = prepare_for_mongo(obj_in.copy() if isinstance(obj_in, dict) else obj_in.dict())
         
-        # Add timestamps
-        from datetime import datetime
+        # Add timestamps at the millisecond precision MongoDB stores, so the
+        # returned document matches what a later read gives back
         now = datetime.utcnow()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
         obj_data["created_at"] = now
         obj_data["updated_at"] = now
         
         result = self.collection.insert_one(obj_data)
-        return self.get(str(result.inserted_id))
+        # The stored document is exactly what was sent, so skip re-reading it
+        obj_data["_id"] = result.inserted_id
+        return serialize_id(obj_data)
     
     def update(self, id: str, obj_in: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update an existing item"""
@@ -48,14 +63,14 @@ class BaseMongoRepository(Generic[T]):
         obj_data = {k: v for k, v in obj_data.items() if v is not None}
         
         # Update timestamp
-        from datetime import datetime
         obj_data["updated_at"] = datetime.utcnow()
         
-        self.collection.update_one(
+        item = self.collection.find_one_and_update(
             {"_id": ObjectId(id)},
-            {"$set": obj_data}
+            {"$set": obj_data},
+            return_document=ReturnDocument.AFTER
         )
-        return self.get(id)
+        return serialize_id(item) if item else None
     
     def remove(self, id: str) -> bool:
         """Delete an item"""
@@ -1,24 +1,28 @@
 from typing import List, Optional, Dict, Any
+from pymongo.errors import OperationFailure
 from app.repositories.base_mongodb import BaseMongoRepository
 from app.schemas.note import NoteCreate, NoteUpdate
 
+# Server error code for a $text query on a collection without a text index
+INDEX_NOT_FOUND = 27
+
 class NoteMongoRepository(BaseMongoRepository):
     """Repository for notes in MongoDB"""
     
     def __init__(self):
         super().__init__("notes")
     
-    def get_notes(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    def get_notes(self, skip: int = 0, limit: int = 100, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all notes with pagination"""
-        return self.get_multi(skip=skip, limit=limit)
+        return self.get_multi(skip=skip, limit=limit, after_id=after_id)
     
     def get_note(self, note_id: str) -> Optional[Dict[str, Any]]:
         """Get note by ID"""
         return self.get(note_id)
     
-    def get_notes_by_category(self, category_id: str, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    def get_notes_by_category(self, category_id: str, skip: int = 0, limit: int = 100, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get notes by category ID"""
-        return self.get_by_filter({"category_ids": category_id}, skip=skip, limit=limit)
+        return self.get_by_filter({"category_ids": category_id}, skip=skip, limit=limit, after_id=after_id)
     
     def create_note(self, note: NoteCreate) -> Dict[str, Any]:
         """Create a new note"""
@@ -45,22 +49,30 @@ class NoteMongoRepository(BaseMongoRepository):
         """Delete a note"""
         return self.remove(note_id)
     
-    def search_notes(self, keyword: Optional[str] = None, category_id: Optional[str] = None, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    def search_notes(self, keyword: Optional[str] = None, category_id: Optional[str] = None, skip: int = 0, limit: int = 100, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Search notes by keyword and/or category"""
         filter_dict = {}
         
-        # Filter by keyword if provided
-        if keyword:
-            filter_dict["$or"] = [
-                {"title": {"$regex": keyword, "$options": "i"}},
-                {"content": {"$regex": keyword, "$options": "i"}}
-            ]
-        
         # Filter by category if provided
         if category_id:
             filter_dict["category_ids"] = category_id
         
-        return self.get_by_filter(filter_dict, skip=skip, limit=limit)
+        if not keyword:
+            return self.get_by_filter(filter_dict, skip=skip, limit=limit, after_id=after_id)
+        
+        # Filter by keyword using the title/content text index created in
+        # init_mongodb rather than an unindexable regex scan
+        try:
+            return self.get_by_filter({**filter_dict, "$text": {"$search": keyword}}, skip=skip, limit=limit, after_id=after_id)
+        except OperationFailure as e:
+            if e.code != INDEX_NOT_FOUND:
+                raise
+        # Databases initialized before the text index existed fall back to the old regex filter
+        filter_dict["$or"] = [
+            {"title": {"$regex": keyword, "$options": "i"}},
+            {"content": {"$regex": keyword, "$options": "i"}}
+        ]
+        return self.get_by_filter(filter_dict, skip=skip, limit=limit, after_id=after_id)
 
 # Create instance for dependency injection
 note_repository = NoteMongoRepository()
@@ -16,9 +16,9 @@ class NoteMongoService:
         """Get a note by ID"""
         return note_repository.get_note(note_id)
     
-    def get_notes(self, db, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    def get_notes(self, db, skip: int = 0, limit: int = 100, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all notes with pagination"""
-        return note_repository.get_notes(skip=skip, limit=limit)
+        return note_repository.get_notes(skip=skip, limit=limit, after_id=after_id)
     
     def get_notes_without_categories(self, db) -> List[Dict[str, Any]]:
         """Get notes that don't have any categories"""
@@ -79,7 +79,7 @@ class NoteMongoService:
             return note
         return None
     
-    def search_notes(self, db, query: NoteSearchQuery, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    def search_notes(self, db, query: NoteSearchQuery, skip: int = 0, limit: int = 100, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Search notes by various criteria"""
         # If natural language query is provided, extract keywords from it
         if query.natural_language_query:
@@ -101,7 +101,8 @@ class NoteMongoService:
             keyword=query.keyword,
             category_id=query.category_id,
             skip=skip, 
-            limit=limit
+            limit=limit,
+            after_id=after_id
         )
     # Create instance for dependency injection
 note_mongo_service = NoteMongoService()
@@ -1,34 +1,64 @@
-import os
+import logging
+from datetime import datetime
 import pytest
 from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
-from pymongo.collection import Collection
 from bson.objectid import ObjectId
 
 from app.db.base import Base
 from app.main import app
 from app.db.session import get_db as sqlalchemy_get_db
 from app.db.mongodb import get_db as mongodb_get_db
+from app.services.note_analysis import NoteAnalysisService
+from app.tests.unit.test_mongodb_helper import MockMongoDB
 
-# Use an in-memory SQLite database for testing SQLAlchemy
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+# ObjectIds shared by the sample MongoDB documents below
+_NOTE_OID_HEX = "507f1f77bcf86cd799439013"
+_NOTE_OID = ObjectId(_NOTE_OID_HEX)
+_CATEGORY_OID_HEX = "507f1f77bcf86cd799439014"
+_CATEGORY_OID = ObjectId(_CATEGORY_OID_HEX)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items):
+    """Keep each test class (or module, for plain functions) on one xdist worker,
+    so its module- and session-scoped mocks are built once on that worker.
+    Runs before xdist reads the xdist_group markers; explicit markers win."""
+    for item in items:
+        if item.get_closest_marker("xdist_group") is None:
+            group = item.nodeid.split("::", 1)[0]
+            if item.cls is not None:
+                group = f"{group}::{item.cls.__name__}"
+            item.add_marker(pytest.mark.xdist_group(name=group))
+
+@pytest.fixture(scope="session", autouse=True)
+def silence_logs():
+    """Disable logging for the test session unless a test opts back in"""
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
 
 @pytest.fixture(scope="session")
-def test_db_engine():
-    """Create a new SQLite in-memory database engine for tests"""
+def test_db_engine(tmp_path_factory):
+    """Create a new SQLite database engine for tests
+    
+    The database file lives in the session's temporary directory, which
+    pytest-xdist makes unique per worker, so parallel workers never share
+    or delete each other's file.
+    """
+    db_path = tmp_path_factory.mktemp("sqlite") / "test.db"
     engine = create_engine(
-        SQLALCHEMY_DATABASE_URL,
+        f"sqlite:///{db_path}",
         connect_args={"check_same_thread": False},
     )
     Base.metadata.create_all(bind=engine)
     yield engine
     # Clean up the database after tests
     Base.metadata.drop_all(bind=engine)
-    # Remove the test database file if it exists
-    if os.path.exists("./test.db"):
-        os.remove("./test.db")
+    engine.dispose()
 
 @pytest.fixture(scope="function")
 def test_db(test_db_engine):
@@ -68,19 +98,49 @@ def client(test_db):
 
 ## MongoDB Test Fixtures ##
 
+@pytest.fixture(scope="session")
+def session_mongodb_collection():
+    """One collection/cursor pair built for the whole session"""
+    return MockMongoDB.mock_collection()
+
+@pytest.fixture
+def mock_mongodb_collection(session_mongodb_collection):
+    """The session collection/cursor pair, reset to its defaults for this test"""
+    mock_coll, mock_cursor = session_mongodb_collection
+    MockMongoDB.reset_collection(mock_coll, mock_cursor)
+    return mock_coll, mock_cursor
+
 @pytest.fixture
-def mock_collection():
-    """Create a mock MongoDB collection"""
-    mock_coll = MagicMock(spec=Collection)
-    return mock_coll
+def mock_collection(mock_mongodb_collection):
+    """Create a mock MongoDB collection; find() returns mock_cursor"""
+    return mock_mongodb_collection[0]
 
 @pytest.fixture
-def mock_mongodb_get_collection(mock_collection):
+def mock_cursor(mock_mongodb_collection):
+    """FakeCursor returned by mock_collection.find()"""
+    return mock_mongodb_collection[1]
+
+@pytest.fixture
+def mock_mongodb_get_collection(monkeypatch, mock_collection):
     """Patch the get_collection function to return a mock collection"""
-    with patch("app.db.mongodb.get_collection", return_value=mock_collection) as mock_get_collection:
-        yield mock_get_collection
+    mock_get_collection = MagicMock(return_value=mock_collection)
+    monkeypatch.setattr("app.db.mongodb.get_collection", mock_get_collection)
+    # Repositories bind get_collection at import time, so patch their reference too
+    monkeypatch.setattr("app.repositories.base_mongodb.get_collection", mock_get_collection)
+    return mock_get_collection
 
 @pytest.fixture
+def frozen_utcnow(monkeypatch):
+    """Freeze datetime.utcnow() as seen by the MongoDB repositories"""
+    fake = MagicMock()
+    fake.utcnow.return_value = datetime(2023, 1, 1)
+    monkeypatch.setattr("app.repositories.base_mongodb.datetime", fake)
+    return fake
+
+# Sample documents are built once per session; tests must treat them as
+# read-only and copy before mutating
+
+@pytest.fixture(scope="session")
 def sample_note_data():
     """Sample note data for testing"""
     return {
@@ -91,7 +151,7 @@ def sample_note_data():
         "updated_at": "2023-01-01T00:00:00"
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_category_data():
     """Sample category data for testing"""
     return {
@@ -101,38 +161,79 @@ def sample_category_data():
         "updated_at": "2023-01-01T00:00:00"
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mongodb_note_with_id(sample_note_data):
     """Sample note data with MongoDB ObjectId"""
     return {
-        "_id": ObjectId("507f1f77bcf86cd799439013"),
+        "_id": _NOTE_OID,
         **sample_note_data
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mongodb_category_with_id(sample_category_data):
     """Sample category data with MongoDB ObjectId"""
     return {
-        "_id": ObjectId("507f1f77bcf86cd799439014"),
+        "_id": _CATEGORY_OID,
         **sample_category_data
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def note_doc_factory():
+    """Factory for raw note documents as stored in MongoDB, with per-call overrides
+    
+    Each call returns a new dict, since serialize_id rewrites documents in place.
+    """
+    base = {
+        "_id": _NOTE_OID,
+        "title": "",
+        "content": "",
+        "created_at": "2023-01-01T00:00:00",
+        "updated_at": "2023-01-02T00:00:00",
+    }
+    def _make(**overrides):
+        return {**base, "category_ids": [], **overrides}
+    return _make
+
+@pytest.fixture(scope="session")
 def serialized_note(mongodb_note_with_id):
     """Note with serialized id for testing"""
     note = dict(mongodb_note_with_id)
-    note["id"] = str(note.pop("_id"))
+    note.pop("_id")
+    note["id"] = _NOTE_OID_HEX
     return note
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def serialized_category(mongodb_category_with_id):
     """Category with serialized id for testing"""
     category = dict(mongodb_category_with_id)
-    category["id"] = str(category.pop("_id"))
+    category.pop("_id")
+    category["id"] = _CATEGORY_OID_HEX
     return category
 
 ## AI Service Mocks ##
 
+@pytest.fixture(scope="session")
+def openai_response_factory():
+    """Factory for stub OpenAI chat completion responses carrying only choices[0].message.content"""
+    def _make(content: str):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+    return _make
+
+@pytest.fixture(scope="session")
+def note_analysis_service():
+    """Note analysis service built once for the session; tests switch OpenAI on as needed"""
+    service = NoteAnalysisService()
+    service.openai_enabled = False
+    service.client = None
+    return service
+
+@pytest.fixture
+def note_analysis_service_disabled(note_analysis_service):
+    """Shared note analysis service with OpenAI turned off, for fallback tests"""
+    note_analysis_service.openai_enabled = False
+    note_analysis_service.client = None
+    return note_analysis_service
+
 @pytest.fixture
 def mock_ai_services():
     """Mock all AI services"""
@@ -0,0 +1,115 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.db.init_mongodb import init_mongodb
+
+
+@pytest.fixture
+def mongo_mocks(monkeypatch):
+    """Database mock with notes/categories collections, returned by get_database"""
+    mock_db = MagicMock()
+    mock_db.notes = MagicMock()
+    mock_db.categories = MagicMock()
+    mock_db.notes.index_information.return_value = {}
+    mock_db.categories.index_information.return_value = {}
+    monkeypatch.setattr('app.db.init_mongodb.get_database', lambda: mock_db)
+    return mock_db
+
+
+@pytest.mark.parametrize("existing_collections,expected_created", [
+    ([], ["notes", "categories"]),
+    (["notes"], ["categories"]),
+    (["notes", "categories"], []),
+], ids=["fresh_db", "notes_only", "both_exist"])
+def test_init_mongodb_creates_missing_collections(mongo_mocks, existing_collections, expected_created):
+    """Test only the missing collections are created"""
+    mongo_mocks.list_collection_names.return_value = existing_collections
+    mongo_mocks.categories.count_documents.return_value = 1
+
+    init_mongodb()
+
+    created = [c.args[0] for c in mongo_mocks.create_collection.call_args_list]
+    assert created == expected_created
+
+
+@pytest.mark.parametrize("count,expected_inserts", [
+    (0, 2), # No default categories yet
+    (1, 0), # Defaults already present
+], ids=["defaults_missing", "defaults_present"])
+def test_init_mongodb_default_categories(mongo_mocks, count, expected_inserts):
+    """Test default categories are inserted only when missing"""
+    mongo_mocks.list_collection_names.return_value = ["notes", "categories"]
+    mongo_mocks.categories.count_documents.return_value = count
+
+    init_mongodb()
+
+    inserted = [c.args[0]["name"] for c in mongo_mocks.categories.insert_one.call_args_list]
+    assert inserted == (["Work", "Personal"] if expected_inserts else [])
+
+
+def _created_index_names(collection):
+    return [model.document["name"] for c in collection.create_indexes.call_args_list for model in c.args[0]]
+
+
+def test_init_mongodb_creates_indexes_in_one_call(mongo_mocks):
+    """Test each collection gets its missing indexes in a single create_indexes call"""
+    mongo_mocks.list_collection_names.return_value = ["notes", "categories"]
+    mongo_mocks.categories.count_documents.return_value = 1
+
+    init_mongodb()
+
+    assert mongo_mocks.notes.create_indexes.call_count == 1
+    assert _created_index_names(mongo_mocks.notes) == ["title_1", "category_ids_1", "notes_text_search"]
+    assert _created_index_names(mongo_mocks.categories) == ["name_1"]
+    assert mongo_mocks.categories.create_indexes.call_args.args[0][0].document["unique"] is True
+    mongo_mocks.notes.create_index.assert_not_called()
+
+
+def test_init_mongodb_skips_existing_indexes(mongo_mocks):
+    """Test indexes that exist by key pattern or name are not recreated"""
+    mongo_mocks.list_collection_names.return_value = ["notes", "categories"]
+    mongo_mocks.categories.count_documents.return_value = 1
+    mongo_mocks.notes.index_information.return_value = {
+        "title_idx": {"key": [("title", 1)]}, # Same key, different name
+        "title_text": {"key": [("_fts", "text"), ("_ftsx", 1)]}, # Text index under another name
+    }
+
+    init_mongodb()
+
+    assert _created_index_names(mongo_mocks.notes) == ["category_ids_1"]
+
+
+def test_init_mongodb_retries_indexes_individually(mongo_mocks):
+    """Test a failing batch falls back to one create_indexes call per index"""
+    mongo_mocks.list_collection_names.return_value = ["notes", "categories"]
+    mongo_mocks.categories.count_documents.return_value = 1
+    unbuilt = {"title_1", "category_ids_1", "notes_text_search"}
+
+    def create_indexes(models):
+        # The batch and the title index fail; the others build on their own
+        if len(models) > 1 or models[0].document["name"] == "title_1":
+            raise Exception("index build failed")
+        unbuilt.discard(models[0].document["name"])
+    mongo_mocks.notes.create_indexes.side_effect = create_indexes
+
+    init_mongodb()
+
+    assert mongo_mocks.notes.create_indexes.call_count == 4
+    assert _created_index_names(mongo_mocks.notes)[3:] == ["title_1", "category_ids_1", "notes_text_search"]
+    assert unbuilt == {"title_1"}
+    mongo_mocks.categories.create_indexes.assert_called_once()
+
+
+def test_init_mongodb_already_initialized(mongo_mocks):
+    """Test no createIndexes command is sent when every index exists"""
+    mongo_mocks.list_collection_names.return_value = ["notes", "categories"]
+    mongo_mocks.categories.count_documents.return_value = 1
+    mongo_mocks.notes.index_information.return_value = {
+        name: {} for name in ["title_1", "category_ids_1", "notes_text_search"]
+    }
+    mongo_mocks.categories.index_information.return_value = {"name_1": {}}
+
+    init_mongodb()
+
+    mongo_mocks.notes.create_indexes.assert_not_called()
+    mongo_mocks.categories.create_indexes.assert_not_called()
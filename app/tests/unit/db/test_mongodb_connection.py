@@ -0,0 +1,68 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from bson.objectid import ObjectId
+
+from app.db import mongodb
+
+
+class TestMongoDBConnection:
+
+    @pytest.fixture
+    def mock_settings(self):
+        return SimpleNamespace(MONGODB_URI="mongodb://test-host:27017", MONGODB_DB_NAME="test_db")
+
+    @pytest.fixture
+    def mock_client(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def mock_mongo_client(self, monkeypatch, mock_settings, mock_client):
+        """Replace MongoClient and settings, and reset the cached client"""
+        mock_mongo_client = MagicMock(return_value=mock_client)
+        monkeypatch.setattr('app.db.mongodb.MongoClient', mock_mongo_client)
+        monkeypatch.setattr('app.db.mongodb.settings', mock_settings)
+        monkeypatch.setattr('app.db.mongodb._client', None)
+        return mock_mongo_client
+
+    def test_get_client(self, mock_mongo_client, mock_client):
+        """Test a client is created once and then reused"""
+        assert mongodb.get_client() is mock_client
+        assert mongodb.get_client() is mock_client
+        mock_mongo_client.assert_called_once_with("mongodb://test-host:27017", serverSelectionTimeoutMS=10000)
+
+    def test_get_client_missing_uri(self, mock_mongo_client, mock_settings):
+        """Test a missing MONGODB_URI raises ValueError"""
+        mock_settings.MONGODB_URI = None
+
+        with pytest.raises(ValueError):
+            mongodb.get_client()
+        mock_mongo_client.assert_not_called()
+
+    def test_get_client_connection_error(self, mock_mongo_client):
+        """Test a failing MongoClient leaves no cached client"""
+        mock_mongo_client.side_effect = Exception("Connection refused")
+
+        assert mongodb.get_client() is None
+
+    def test_get_database_and_collection(self, mock_mongo_client, mock_client):
+        """Test the configured database and collection are looked up on the client"""
+        mock_db = mock_client.__getitem__.return_value
+
+        assert mongodb.get_database() is mock_db
+        assert mongodb.get_collection("notes") is mock_db.__getitem__.return_value
+        mock_client.__getitem__.assert_called_with("test_db")
+        mock_db.__getitem__.assert_called_once_with("notes")
+
+    def test_get_db_without_uri(self, mock_mongo_client, mock_settings):
+        """Test the get_db dependency yields None when MongoDB is not configured"""
+        mock_settings.MONGODB_URI = ""
+
+        assert list(mongodb.get_db()) == [None]
+
+    def test_serialize_id_and_prepare_for_mongo(self):
+        """Test _id/id conversion helpers"""
+        object_id = ObjectId()
+
+        assert mongodb.serialize_id({"_id": object_id, "name": "Work"}) == {"id": str(object_id), "name": "Work"}
+        assert mongodb.prepare_for_mongo({"id": 1, "name": "Work"}) == {"name": "Work"}
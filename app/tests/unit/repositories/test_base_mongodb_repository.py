@@ -0,0 +1,62 @@
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from bson.objectid import ObjectId
+from pymongo import ReturnDocument
+
+from app.repositories.base_mongodb import BaseMongoRepository
+
+
+@pytest.fixture
+def repo(mock_mongodb_get_collection):
+    """Repository whose collection lookup returns the mock collection"""
+    return BaseMongoRepository("notes")
+
+
+class TestBaseMongoRepository:
+
+    def test_create(self, repo, mock_collection, frozen_utcnow):
+        """Test create stamps both timestamps and returns the stored document"""
+        object_id = ObjectId()
+        mock_collection.insert_one.return_value = MagicMock(inserted_id=object_id)
+        now = frozen_utcnow.utcnow.return_value
+
+        result = repo.create({"title": "Test Note"})
+
+        insert_data = mock_collection.insert_one.call_args.args[0]
+        assert insert_data["created_at"] == now
+        assert insert_data["updated_at"] == now
+        assert result == {"id": str(object_id), "title": "Test Note", "created_at": now, "updated_at": now}
+        mock_collection.find_one.assert_not_called() # No re-read after the insert
+
+    def test_create_truncates_timestamps_to_milliseconds(self, repo, mock_collection, frozen_utcnow):
+        """Test create returns timestamps at the precision MongoDB stores them"""
+        mock_collection.insert_one.return_value = MagicMock(inserted_id=ObjectId())
+        frozen_utcnow.utcnow.return_value = datetime(2023, 1, 1, 12, 30, 45, 123456)
+
+        result = repo.create({"title": "Test Note"})
+
+        assert result["created_at"] == datetime(2023, 1, 1, 12, 30, 45, 123000)
+        assert result["updated_at"] == result["created_at"]
+
+    def test_update(self, repo, mock_collection, frozen_utcnow):
+        """Test update drops None values, refreshes updated_at and returns the updated document"""
+        object_id = ObjectId()
+        mock_collection.find_one_and_update.return_value = {"_id": object_id, "title": "Updated"}
+
+        result = repo.update(str(object_id), {"title": "Updated", "content": None})
+
+        call_args = mock_collection.find_one_and_update.call_args
+        assert call_args.args == (
+            {"_id": object_id},
+            {"$set": {"title": "Updated", "updated_at": frozen_utcnow.utcnow.return_value}},
+        )
+        assert call_args.kwargs == {"return_document": ReturnDocument.AFTER}
+        assert result == {"id": str(object_id), "title": "Updated"}
+        mock_collection.find_one.assert_not_called()
+
+    def test_update_not_found(self, repo, mock_collection, frozen_utcnow):
+        """Test update returns None when no document matches"""
+        mock_collection.find_one_and_update.return_value = None
+
+        assert repo.update(str(ObjectId()), {"title": "Updated"}) is None
@@ -0,0 +1,172 @@
+import pytest
+from unittest.mock import MagicMock
+from bson.objectid import ObjectId
+from pymongo.errors import OperationFailure
+
+from app.repositories.note_mongodb import NoteMongoRepository, INDEX_NOT_FOUND
+from app.schemas.note import NoteCreate, NoteUpdate
+from app.tests.unit.test_mongodb_helper import MockMongoDB
+
+# ObjectIds reused across tests; category ids are stored on notes as hex strings
+_OID_10 = ObjectId("507f1f77bcf86cd799439010")
+_OID_22 = ObjectId("507f1f77bcf86cd799439022")
+_CATEGORY_ID_11 = "507f1f77bcf86cd799439011"
+
+
+@pytest.fixture(scope="module")
+def repo():
+    """Repository instance shared by the module; its collection is looked up per call"""
+    return NoteMongoRepository()
+
+
+class TestNoteMongoRepository:
+    """Tests for the NoteMongoRepository"""
+
+    # Cursor documents are copied because serialize_id rewrites them in place
+    # and the sample fixtures are shared for the session
+
+    def test_get_notes(self, repo, mock_collection, mock_mongodb_get_collection, mongodb_note_with_id, serialized_note, mock_cursor):
+        """Test get_notes returns serialized notes, newest first, with pagination"""
+        MockMongoDB.configure_cursor(mock_cursor, [dict(mongodb_note_with_id)])
+
+        result = repo.get_notes(skip=5, limit=10)
+
+        assert result == [serialized_note]
+        assert mock_cursor.calls == [("sort", ("_id", -1)), ("skip", (5,)), ("batch_size", (10,)), ("limit", (10,))]
+        mock_mongodb_get_collection.assert_called_with("notes")
+
+    def test_get_notes_after_id(self, repo, mock_collection, mock_mongodb_get_collection, mongodb_note_with_id, serialized_note, mock_cursor):
+        """Test get_notes with after_id pages on an _id range in the same order as skip"""
+        MockMongoDB.configure_cursor(mock_cursor, [dict(mongodb_note_with_id)])
+        result = repo.get_notes(after_id=str(_OID_10), limit=10)
+
+        assert result == [serialized_note]
+        mock_collection.find.assert_called_once_with({"_id": {"$lt": _OID_10}})
+        assert mock_cursor.calls == [("sort", ("_id", -1)), ("batch_size", (10,)), ("limit", (10,))] # No skip
+
+    @pytest.mark.parametrize("limit", [0, -1], ids=["unlimited", "negative"])
+    def test_get_notes_without_positive_limit(self, repo, mock_collection, mock_mongodb_get_collection, mongodb_note_with_id, mock_cursor, limit):
+        """Test get_notes leaves the batch size alone when limit isn't a page size"""
+        MockMongoDB.configure_cursor(mock_cursor, [dict(mongodb_note_with_id)])
+
+        repo.get_notes(limit=limit)
+
+        assert mock_cursor.calls == [("sort", ("_id", -1)), ("limit", (limit,))] # No batch_size
+
+    def test_get_notes_rejects_skip_with_after_id(self, repo, mock_collection, mock_mongodb_get_collection):
+        """Test get_notes refuses to combine an offset with a page cursor"""
+        with pytest.raises(ValueError):
+            repo.get_notes(skip=5, after_id=str(_OID_10))
+        mock_collection.find.assert_not_called()
+
+    def test_get_note(self, repo, mock_collection, mock_mongodb_get_collection, note_doc_factory):
+        """Test get_note looks the note up by ObjectId"""
+        doc = note_doc_factory(title="Existing Note", content="Existing Content")
+        note_id = doc["_id"]
+        mock_collection.find_one.return_value = doc
+
+        result = repo.get_note(str(note_id))
+
+        assert result["id"] == str(note_id)
+        assert "_id" not in result
+        assert result["title"] == "Existing Note"
+        mock_collection.find_one.assert_called_once_with({"_id": note_id})
+
+    def test_get_note_not_found(self, repo, mock_collection, mock_mongodb_get_collection):
+        """Test get_note returns None when no document matches"""
+        mock_collection.find_one.return_value = None
+
+        assert repo.get_note(str(_OID_22)) is None
+
+    def test_get_notes_by_category(self, repo, mock_collection, mock_mongodb_get_collection, mongodb_note_with_id, serialized_note, mock_cursor):
+        """Test get_notes_by_category filters on category_ids"""
+        MockMongoDB.configure_cursor(mock_cursor, [dict(mongodb_note_with_id)])
+        category_id = mongodb_note_with_id["category_ids"][0]
+
+        result = repo.get_notes_by_category(category_id, limit=10)
+
+        assert result == [serialized_note]
+        mock_collection.find.assert_called_once_with({"category_ids": category_id})
+        assert ("batch_size", (10,)) in mock_cursor.calls
+
+    def test_create_note(self, repo, mock_collection, mock_mongodb_get_collection, mongodb_note_with_id, serialized_note, frozen_utcnow):
+        """Test create_note stores the note data and returns it without re-reading"""
+        mock_collection.insert_one.return_value = MagicMock(inserted_id=mongodb_note_with_id["_id"])
+        note_in = NoteCreate(title="Test Note", content="This is a test note", category_ids=[_CATEGORY_ID_11])
+
+        result = repo.create_note(note_in)
+
+        assert result["id"] == serialized_note["id"]
+        assert result["title"] == "Test Note"
+        assert result["category_ids"] == [_CATEGORY_ID_11]
+        assert result["created_at"] == frozen_utcnow.utcnow.return_value
+        assert mock_collection.insert_one.call_args.args[0] is result # Inserted dict is returned as-is
+        mock_collection.find_one.assert_not_called()
+
+    def test_update_note(self, repo, mock_collection, mock_mongodb_get_collection, note_doc_factory, frozen_utcnow):
+        """Test update_note only sets the fields that were provided"""
+        doc = note_doc_factory(title="Updated Note", content="Existing Content")
+        note_id = doc["_id"]
+        mock_collection.find_one_and_update.return_value = doc
+
+        result = repo.update_note(str(note_id), NoteUpdate(title="Updated Note"))
+
+        assert result["id"] == str(note_id)
+        assert result["title"] == "Updated Note"
+        query, update = mock_collection.find_one_and_update.call_args.args
+        assert query == {"_id": note_id}
+        assert update == {"$set": {"title": "Updated Note", "updated_at": frozen_utcnow.utcnow.return_value}}
+
+    @pytest.mark.parametrize("deleted_count,expected", [(1, True), (0, False)], ids=["deleted", "not_found"])
+    def test_delete_note(self, repo, mock_collection, mock_mongodb_get_collection, deleted_count, expected):
+        """Test delete_note reports whether a document was removed"""
+        mock_collection.delete_one.return_value = MagicMock(deleted_count=deleted_count)
+        assert repo.delete_note(str(_OID_22)) is expected
+        mock_collection.delete_one.assert_called_once_with({"_id": _OID_22})
+
+    @pytest.mark.parametrize("keyword,category_id,after_id,expected_keys", [
+        ("test", None, None, {"$text"}), # Keyword goes through the title/content text index
+        (None, _CATEGORY_ID_11, None, {"category_ids"}),
+        ("test", _CATEGORY_ID_11, None, {"$text", "category_ids"}),
+        ("test", None, str(_OID_10), {"$text", "_id"}), # Next page of a keyword search
+    ], ids=["keyword_only", "category_only", "both_filters", "keyword_after_id"])
+    def test_search_notes(self, repo, mock_collection, mock_mongodb_get_collection, mongodb_note_with_id, mock_cursor, keyword, category_id, after_id, expected_keys):
+        """Test search_notes builds the filter from whichever criteria are given"""
+        MockMongoDB.configure_cursor(mock_cursor, [dict(mongodb_note_with_id)])
+
+        result = repo.search_notes(keyword=keyword, category_id=category_id, after_id=after_id, limit=10)
+
+        assert len(result) == 1
+        filter_dict = mock_collection.find.call_args.args[0]
+        assert set(filter_dict) == expected_keys
+        if keyword:
+            assert filter_dict["$text"] == {"$search": keyword}
+        if category_id:
+            assert filter_dict["category_ids"] == category_id
+
+    def test_search_notes_without_text_index(self, repo, mock_collection, mock_mongodb_get_collection, mongodb_note_with_id, mock_cursor):
+        """Test search_notes falls back to a regex filter when the text index is missing"""
+        mock_collection.find.side_effect = [
+            OperationFailure("text index required for $text query", code=INDEX_NOT_FOUND),
+            MockMongoDB.configure_cursor(mock_cursor, [dict(mongodb_note_with_id)]),
+        ]
+
+        result = repo.search_notes(keyword="test", category_id=_CATEGORY_ID_11, limit=10)
+
+        assert len(result) == 1
+        filter_dict = mock_collection.find.call_args.args[0]
+        assert filter_dict == {
+            "category_ids": _CATEGORY_ID_11,
+            "$or": [
+                {"title": {"$regex": "test", "$options": "i"}},
+                {"content": {"$regex": "test", "$options": "i"}}
+            ]
+        }
+
+    def test_search_notes_reraises_other_failures(self, repo, mock_collection, mock_mongodb_get_collection):
+        """Test search_notes only falls back for the missing text index error"""
+        mock_collection.find.side_effect = OperationFailure("not authorized", code=13)
+
+        with pytest.raises(OperationFailure):
+            repo.search_notes(keyword="test", limit=10)
+        assert mock_collection.find.call_count == 1
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, patch, call
 from bson import ObjectId # If using MongoDB ObjectIds
 
 # Assuming schemas are Pydantic models or similar structures
@@ -48,14 +48,14 @@ ALL_CATEGORIES = [TEST_CATEGORY_1, TEST_CATEGORY_2]
 
 # --- Fixtures for Mocks ---
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_category_repository():
     """Fixture to mock the category repository dependency."""
     # Patch where the repository is looked up (imported) in the service module
     with patch('app.services.categories.category_repository', create=True) as mock_repo:
         yield mock_repo
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_categorization_service():
     """Fixture to mock the categorization service dependency."""
     # Patch where the service is looked up (imported) in the service module
@@ -76,24 +76,20 @@ class TestCategoryMongoService:
         """
         self.mock_categorization_service = mock_categorization_service
         self.mock_category_repository = mock_category_repository
-        # Reset mocks before each test run
-        self.mock_categorization_service.reset_mock()
-        self.mock_category_repository.reset_mock()
+        # Reset mocks before each test run; they are shared across the module,
+        # so configured return values and side effects must be cleared too
+        self.mock_categorization_service.reset_mock(return_value=True, side_effect=True)
+        self.mock_category_repository.reset_mock(return_value=True, side_effect=True)
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def service_instance(self, mock_category_repository, mock_categorization_service):
         """
-        Fixture to create a new service instance for each test.
-        Crucially, it depends on the mock fixtures to ensure the patches
-        are active *before* the service is instantiated.
+        Fixture to create one service instance for the module.
+        It depends on the mock fixtures to ensure the patches are active
+        *before* the service is instantiated; the service itself holds no
+        per-test state, so sharing it is safe.
         """
-        # The patches from the mock fixtures are active here
-        service = CategoryMongoService()
-        # Optionally attach mocks to service instance if needed within methods,
-        # but usually accessing via self.mock_* is sufficient in tests.
-        # service.category_repository = mock_category_repository # Example if needed
-        # service.categorization_service = mock_categorization_service # Example if needed
-        return service
+        return CategoryMongoService()
 
     # --- get_category Tests ---
 
@@ -151,8 +147,8 @@ class TestCategoryMongoService:
         result = service_instance.create_category(None, category_data) # db is unused
 
         assert result == created_category
-        self.mock_category_repository.get_category_by_name.assert_called_once_with("New Category")
-        self.mock_category_repository.create_category.assert_called_once_with(category_data)
+        assert self.mock_category_repository.get_category_by_name.call_args_list == [call("New Category")]
+        assert self.mock_category_repository.create_category.call_args_list == [call(category_data)]
 
     def test_create_category_already_exists(self, service_instance):
         """Test create_category when name already exists"""
@@ -182,10 +178,10 @@ class TestCategoryMongoService:
         result = service_instance.update_category(None, TEST_CATEGORY_ID_1, category_update_data) # db unused
 
         assert result == updated_category_from_repo
-        self.mock_category_repository.get_category.assert_called_once_with(TEST_CATEGORY_ID_1)
-        self.mock_category_repository.get_category_by_name.assert_called_once_with("Updated Work Name")
-        # Check repo update called with correct args (may need model_dump depending on repo implementation)
-        self.mock_category_repository.update_category.assert_called_once_with(TEST_CATEGORY_ID_1, category_update_data)
+        assert self.mock_category_repository.get_category.call_args_list == [call(TEST_CATEGORY_ID_1)]
+        assert self.mock_category_repository.get_category_by_name.call_args_list == [call("Updated Work Name")]
+        # Check repo update called once with correct args (may need model_dump depending on repo implementation)
+        assert self.mock_category_repository.update_category.call_args_list == [call(TEST_CATEGORY_ID_1, category_update_data)]
 
     def test_update_category_not_found(self, service_instance):
         """Test update_category when the category to update does not exist"""
@@ -246,8 +242,8 @@ class TestCategoryMongoService:
         result = service_instance.delete_category(None, TEST_CATEGORY_ID_1) # db unused
 
         assert result == TEST_CATEGORY_1 # Returns the deleted category object
-        self.mock_category_repository.get_category.assert_called_once_with(TEST_CATEGORY_ID_1)
-        self.mock_category_repository.delete_category.assert_called_once_with(TEST_CATEGORY_ID_1)
+        assert self.mock_category_repository.get_category.call_args_list == [call(TEST_CATEGORY_ID_1)]
+        assert self.mock_category_repository.delete_category.call_args_list == [call(TEST_CATEGORY_ID_1)]
 
     def test_delete_category_not_found(self, service_instance):
         """Test delete_category when the category does not exist"""
@@ -1,6 +1,6 @@
 import pytest
-from unittest.mock import MagicMock, patch
-import logging
+from unittest.mock import MagicMock, patch, DEFAULT
+from types import SimpleNamespace
 from bson import ObjectId  # Import ObjectId if category IDs are MongoDB ObjectIds
 
 # Assume the class CategorizationService is in 'app.services.categorization.py'
@@ -46,19 +46,6 @@ except ImportError:
                     "method": "default"
                  })
 
-# Disable logging for tests unless specifically testing logging
-logging.disable(logging.CRITICAL)
-
-# Mock response structure helper for OpenAI calls
-def create_mock_openai_response(content: str):
-    """Creates a mock object mimicking OpenAI chat completion response"""
-    mock_response = MagicMock()
-    mock_choice = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = content
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    return mock_response
 
 # Sample categories data mimicking repository response
 SAMPLE_CATEGORY_ID_WORK = str(ObjectId()) # Generate a realistic ObjectId string
@@ -78,22 +65,24 @@ class TestCategorizationService:
 
     @pytest.fixture
     def mock_settings(self):
-        """Fixture to mock settings."""
-        with patch('app.services.categorization.settings', create=True) as mock_settings_obj:
-            # Default values
-            mock_settings_obj.OPENAI_API_KEY = None
-            mock_settings_obj.ENABLE_AI_FEATURES = False
-            yield mock_settings_obj
+        """Fixture for a plain settings stand-in."""
+        # Default values
+        return SimpleNamespace(OPENAI_API_KEY=None, ENABLE_AI_FEATURES=False)
 
     @pytest.fixture
     def mock_openai_client(self):
-        """Fixture to mock the OpenAI client class."""
-        with patch('app.services.categorization.OpenAI', create=True) as mock_openai_class:
-            mock_instance = MagicMock()
-            # Mock the specific method used
-            mock_instance.chat.completions.create = MagicMock()
-            mock_openai_class.return_value = mock_instance
-            yield mock_openai_class, mock_instance # Yield class and instance
+        """Fixture for the OpenAI client class and the instance it returns."""
+        # Only chat.completions.create is ever read, so skip the auto-created MagicMock chain
+        mock_instance = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=MagicMock())))
+        mock_openai_class = MagicMock(return_value=mock_instance)
+        return mock_openai_class, mock_instance # Class and instance
+
+    @pytest.fixture(autouse=True)
+    def patch_dependencies(self, monkeypatch, mock_settings, mock_openai_client):
+        """Swap settings and OpenAI in the service module once per test."""
+        mock_openai_class, _ = mock_openai_client
+        monkeypatch.setattr('app.services.categorization.settings', mock_settings)
+        monkeypatch.setattr('app.services.categorization.OpenAI', mock_openai_class)
 
     @pytest.fixture
     def mock_category_repo(self):
@@ -103,30 +92,32 @@ class TestCategorizationService:
             mock_repo.get_categories.return_value = SAMPLE_CATEGORIES_DB
             yield mock_repo
 
+    @pytest.fixture(scope="module")
+    def service(self):
+        """Single service instance shared by the module, built with OpenAI disabled."""
+        with patch.multiple('app.services.categorization', settings=DEFAULT, OpenAI=DEFAULT) as mocks:
+            mocks["settings"].OPENAI_API_KEY = ""
+            mocks["settings"].ENABLE_AI_FEATURES = False
+            return CategorizationService()
+
     @pytest.fixture
-    def service_instance(self, mock_settings, mock_openai_client, mock_category_repo):
-        """Fixture to create a service instance with mocked dependencies."""
-        # Note: The mocks are active due to the context managers in their fixtures
-        # We just need to ensure settings are configured correctly *before* init
-        mock_settings.OPENAI_API_KEY = "test-api-key"
-        mock_settings.ENABLE_AI_FEATURES = True
-        service = CategorizationService()
-        # Manually attach mocks if needed for direct access in tests, though often not required
-        service.mock_settings = mock_settings
-        service.mock_openai_class, service.mock_openai_instance = mock_openai_client
-        service.mock_category_repo = mock_category_repo
+    def service_instance(self, monkeypatch, service, mock_openai_client, mock_category_repo):
+        """Fixture for the shared service with OpenAI enabled for one test."""
+        # monkeypatch reverts these on teardown so the shared instance stays clean
+        _, mock_openai_instance = mock_openai_client
+        monkeypatch.setattr(service, 'openai_enabled', True)
+        monkeypatch.setattr(service, 'client', mock_openai_instance)
+        # Attach mocks for direct access in tests
+        monkeypatch.setattr(service, 'mock_openai_instance', mock_openai_instance, raising=False)
+        monkeypatch.setattr(service, 'mock_category_repo', mock_category_repo, raising=False)
         return service
 
     @pytest.fixture
-    def service_instance_openai_disabled(self, mock_settings, mock_openai_client, mock_category_repo):
-        """Fixture for service instance with OpenAI explicitly disabled."""
-        mock_settings.OPENAI_API_KEY = None # Disable via key
-        mock_settings.ENABLE_AI_FEATURES = True
-        service = CategorizationService()
-         # Manually attach mocks if needed
-        service.mock_settings = mock_settings
-        service.mock_openai_class, service.mock_openai_instance = mock_openai_client
-        service.mock_category_repo = mock_category_repo
+    def service_instance_openai_disabled(self, monkeypatch, service, mock_openai_client, mock_category_repo):
+        """Fixture for the shared service with OpenAI explicitly disabled."""
+        _, mock_openai_instance = mock_openai_client
+        monkeypatch.setattr(service, 'mock_openai_instance', mock_openai_instance, raising=False)
+        monkeypatch.setattr(service, 'mock_category_repo', mock_category_repo, raising=False)
         return service
 
     # --- Initialization Tests ---
@@ -140,7 +131,8 @@ class TestCategorizationService:
         service = CategorizationService()
 
         assert service.openai_enabled is True
-        assert service.client == mock_openai_instance
+        assert service.api_key == "test-api-key"
+        assert service.client is mock_openai_instance
         mock_openai_class.assert_called_once_with(api_key="test-api-key")
         mock_category_repo.get_categories.assert_not_called() # Repo not called during init
 
@@ -261,58 +253,41 @@ class TestCategorizationService:
 
     # --- _openai_categorization Tests ---
 
-    def test_openai_categorization_success_match(self, service_instance):
-        """Test _openai_categorization successfully returns a matched category and ID"""
+    @pytest.mark.parametrize("title,content,openai_reply,expected_category,expected_id", [
+        ("Team Sync", "Discuss project updates", "Work", "Work", SAMPLE_CATEGORY_ID_WORK),
+        # Simulate OpenAI response needing cleanup
+        ("My Side Hustle", "Ideas for the app", "This looks like a Personal Project.", "Personal Project", SAMPLE_CATEGORY_ID_PERSONAL),
+    ], ids=["exact_match", "partial_match_cleanup"])
+    def test_openai_categorization_success(self, service_instance, openai_response_factory, title, content, openai_reply, expected_category, expected_id):
+        """Test _openai_categorization matches (and cleans up) the reply to a DB category and ID"""
         service = service_instance
         mock_openai_instance = service.mock_openai_instance
         mock_category_repo = service.mock_category_repo
 
         # Configure mocks
         mock_category_repo.get_categories.return_value = SAMPLE_CATEGORIES_DB
-        mock_openai_instance.chat.completions.create.return_value = create_mock_openai_response("Work")
+        mock_openai_instance.chat.completions.create.return_value = openai_response_factory(openai_reply)
 
         # Call the private method
-        category, category_id, confidence = service._openai_categorization("Team Sync", "Discuss project updates")
-
-        # Verify repo call
-        mock_category_repo.get_categories.assert_called_once()
+        category, category_id, confidence = service._openai_categorization(title, content)
 
-        # Verify OpenAI call
-        mock_openai_instance.chat.completions.create.assert_called_once()
+        # Verify OpenAI call; the DB categories in the prompt show the repo was read
         call_args = mock_openai_instance.chat.completions.create.call_args.kwargs
         assert call_args["model"] == "gpt-4o"
         assert call_args["temperature"] == 0.2
-        assert "Categorize the following note" in call_args["messages"][1]["content"]
+        prompt = call_args["messages"][1]["content"]
+        assert "Categorize the following note" in prompt
         # Check categories from DB are in the prompt
-        assert "Work" in call_args["messages"][1]["content"]
-        assert "Personal Project" in call_args["messages"][1]["content"]
-        assert "Team Sync" in call_args["messages"][1]["content"]
-        assert "Discuss project updates" in call_args["messages"][1]["content"]
+        assert "Work" in prompt
+        assert "Personal Project" in prompt
+        assert title in prompt
+        assert content in prompt
 
         # Verify result
-        assert category == "Work"
-        assert category_id == SAMPLE_CATEGORY_ID_WORK
+        assert category == expected_category
+        assert category_id == expected_id
         assert confidence == 0.9 # Fixed confidence in current implementation
 
-    def test_openai_categorization_success_partial_match_cleanup(self, service_instance):
-        """Test _openai_categorization cleans up response and finds category ID"""
-        service = service_instance
-        mock_openai_instance = service.mock_openai_instance
-        mock_category_repo = service.mock_category_repo
-
-        # Configure mocks
-        mock_category_repo.get_categories.return_value = SAMPLE_CATEGORIES_DB
-        # Simulate OpenAI response needing cleanup
-        mock_openai_instance.chat.completions.create.return_value = create_mock_openai_response("This looks like a Personal Project.")
-
-        category, category_id, confidence = service._openai_categorization("My Side Hustle", "Ideas for the app")
-
-        assert category == "Personal Project" # Cleaned category name
-        assert category_id == SAMPLE_CATEGORY_ID_PERSONAL
-        assert confidence == 0.9
-        mock_category_repo.get_categories.assert_called_once()
-        mock_openai_instance.chat.completions.create.assert_called_once()
-
     def test_openai_categorization_no_db_categories(self, service_instance):
         """Test _openai_categorization returns Uncategorized if DB has no categories"""
         service = service_instance
@@ -331,7 +306,7 @@ class TestCategorizationService:
         mock_category_repo.get_categories.assert_called_once()
         mock_openai_instance.chat.completions.create.assert_not_called() # Skips OpenAI call
 
-    def test_openai_categorization_openai_response_no_match(self, service_instance):
+    def test_openai_categorization_openai_response_no_match(self, service_instance, openai_response_factory):
         """Test _openai_categorization when OpenAI response doesn't match any known category"""
         service = service_instance
         mock_openai_instance = service.mock_openai_instance
@@ -341,7 +316,7 @@ class TestCategorizationService:
         mock_category_repo.get_categories.return_value = SAMPLE_CATEGORIES_DB
         # Simulate OpenAI response that doesn't contain known category keywords
         openai_raw_response = "This note is about general tasks."
-        mock_openai_instance.chat.completions.create.return_value = create_mock_openai_response(openai_raw_response)
+        mock_openai_instance.chat.completions.create.return_value = openai_response_factory(openai_raw_response)
 
         category, category_id, confidence = service._openai_categorization("Random Tasks", "List of things to do")
 
@@ -350,8 +325,6 @@ class TestCategorizationService:
         assert category_id is None # No ID found
         assert confidence == 0.9 # Still returns fixed confidence
 
-        mock_category_repo.get_categories.assert_called_once()
-        mock_openai_instance.chat.completions.create.assert_called_once()
         # Note: A potentially better behavior here might be to return "Uncategorized", None, 0.5
 
     def test_openai_categorization_openai_api_error(self, service_instance):
@@ -391,65 +364,31 @@ class TestCategorizationService:
 
 
     # --- extract_keywords Tests ---
-    # These tests don't need the full service instance fixture with external mocks
-
-    @pytest.fixture
-    def keyword_service(self):
-        """Basic service instance just for keyword extraction"""
-        # No need to mock external dependencies for these tests
-        with patch('app.services.categorization.settings'), \
-             patch('app.services.categorization.OpenAI'), \
-             patch('app.services.categorization.category_repository'):
-            service = CategorizationService()
-        return service
-
-    def test_extract_keywords_standard(self, keyword_service):
-        """Test extract_keywords method with standard text"""
-        text = "This is a meeting note about the project timeline and budget considerations."
-        keywords = keyword_service.extract_keywords(text)
-        assert len(keywords) <= 5
-        assert "meeting" in keywords
-        assert "note" in keywords # 'note' is not in default stop words
-        assert "project" in keywords
-        assert "timeline" in keywords
-        assert "budget" in keywords
-        # Verify stop words are removed
-        assert "this" not in keywords
-        assert "is" not in keywords
-        assert "a" not in keywords
-        assert "the" not in keywords
-        assert "and" not in keywords
-
-    def test_extract_keywords_with_empty_text(self, keyword_service):
-        """Test extract_keywords with empty text"""
-        keywords = keyword_service.extract_keywords("")
-        assert keywords == []
-
-    def test_extract_keywords_with_custom_max(self, keyword_service):
-        """Test extract_keywords with custom max_keywords"""
-        text = "Comprehensive meeting note: project timeline, budget, resources, allocation, team, responsibilities, stakeholders."
-        keywords = keyword_service.extract_keywords(text, max_keywords=3)
-        assert len(keywords) == 3
-        # Check if the most frequent non-stopwords are picked
-        assert "meeting" in keywords or "note" in keywords or "project" in keywords # Example check
-
-    def test_extract_keywords_with_punctuation_and_case(self, keyword_service):
-        """Test extract_keywords handles punctuation and mixed case"""
-        text = "Meeting! Discuss PROJECT Budget? Timeline... OK."
-        keywords = keyword_service.extract_keywords(text)
-        assert "meeting" in keywords
-        assert "discuss" in keywords # 'discuss' not a stop word
-        assert "project" in keywords
-        assert "budget" in keywords
-        assert "timeline" in keywords
-        # Check lowercase conversion and punctuation removal
-        assert "ok" not in keywords # 'ok' might be too short (len > 2 filter)
-        assert "meeting!" not in keywords
-        assert "budget?" not in keywords
-
-    def test_extract_keywords_only_stopwords_or_short(self, keyword_service):
-        """Test extract_keywords with text containing only stopwords or short words"""
-        text = "is the a and for of it go ok"
-        keywords = keyword_service.extract_keywords(text)
-        assert keywords == [] # 'go', 'ok' filtered by len > 2
-
+    # These tests don't need the external mocks, only the shared service instance
+
+    @pytest.mark.parametrize("text,max_keywords,expected_len,must_contain,must_exclude", [
+        # Standard text; 'note' is not in default stop words
+        ("This is a meeting note about the project timeline and budget considerations.", None, None,
+         {"meeting", "note", "project", "timeline", "budget"}, {"this", "is", "a", "the", "and"}),
+        ("", None, 0, set(), set()),
+        # Custom max_keywords; the most frequent non-stopwords are picked
+        ("Comprehensive meeting note: project timeline, budget, resources, allocation, team, responsibilities, stakeholders.", 3, 3,
+         {"meeting"}, set()),
+        # Lowercase conversion and punctuation removal; 'ok' is filtered by the len > 2 rule
+        ("Meeting! Discuss PROJECT Budget? Timeline... OK.", None, None,
+         {"meeting", "discuss", "project", "budget", "timeline"}, {"ok", "meeting!", "budget?"}),
+        # Only stopwords or short words; 'go', 'ok' filtered by len > 2
+        ("is the a and for of it go ok", None, 0, set(), set()),
+    ], ids=["standard", "empty_text", "custom_max", "punctuation_and_case", "only_stopwords_or_short"])
+    def test_extract_keywords(self, service, text, max_keywords, expected_len, must_contain, must_exclude):
+        """Test extract_keywords filtering, normalisation and max_keywords handling"""
+        if max_keywords is None:
+            keywords = service.extract_keywords(text)
+        else:
+            keywords = service.extract_keywords(text, max_keywords=max_keywords)
+
+        assert len(keywords) <= (max_keywords or 5)
+        if expected_len is not None:
+            assert len(keywords) == expected_len
+        assert must_contain <= set(keywords)
+        assert not must_exclude & set(keywords)
@@ -1,400 +1,201 @@
-import unittest
-from unittest.mock import patch, MagicMock, PropertyMock
-import logging
+import pytest
+from unittest.mock import Mock
+from types import SimpleNamespace
 from typing import Dict, Any
 
 # Assume the class NoteAnalysisService is in 'NoteAnalysisService.py'
 # Adjust the import path if necessary
-from app.services.note_analysis import NoteAnalysisService 
-# Disable logging for tests unless specifically testing logging
-logging.disable(logging.CRITICAL)
-
-# Mock response structure helper
-def create_mock_openai_response(content: str):
-    """Creates a mock object mimicking OpenAI chat completion response"""
-    mock_response = MagicMock()
-    mock_choice = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = content
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    return mock_response
-
-class TestNoteAnalysisService(unittest.TestCase):
-
-    def setUp(self):
-        # Sample data
-        self.test_title = "Test Note Title"
-        self.test_content_long = "This is a long piece of content designed for testing summarization. " * 15
-        self.test_content_short = "Short content."
-        self.test_content_empty = ""
+from app.services.note_analysis import NoteAnalysisService
+
+# Sample data
+TEST_TITLE = "Test Note Title"
+TEST_CONTENT_LONG = "This is a long piece of content designed for testing summarization. " * 15
+TEST_CONTENT_SHORT = "Short content."
+TEST_CONTENT_EMPTY = ""
+
+class _FakeSettings:
+    """Plain stand-in for app settings; tests flip attributes on the instance"""
+    OPENAI_API_KEY = None
+    ENABLE_AI_FEATURES = True
+
+class _FakeClient:
+    """OpenAI client stand-in exposing only chat.completions.create"""
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=Mock()))
+
+class _FakeOpenAI:
+    """Callable stand-in for the OpenAI class that hands back a pre-built client"""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.client
+
+class TestNoteAnalysisService:
+
+    # --- Fixtures ---
+
+    @pytest.fixture
+    def mock_client(self):
+        """Fixture for the OpenAI client instance handed to the service."""
+        return _FakeClient()
+
+    @pytest.fixture
+    def fake_settings(self):
+        """Fixture for the settings object seen by the service."""
+        return _FakeSettings()
+
+    @pytest.fixture
+    def fake_openai(self, mock_client):
+        """Fixture for the OpenAI class seen by the service."""
+        return _FakeOpenAI(mock_client)
+
+    @pytest.fixture(autouse=True)
+    def patch_dependencies(self, monkeypatch, fake_settings, fake_openai):
+        """Swap settings and OpenAI in the service module once per test."""
+        monkeypatch.setattr('app.services.note_analysis.settings', fake_settings)
+        monkeypatch.setattr('app.services.note_analysis.OpenAI', fake_openai)
+
+    @pytest.fixture
+    def service(self, note_analysis_service, mock_client):
+        """Session service switched on against this test's client, switched off again after."""
+        note_analysis_service.openai_enabled = True
+        note_analysis_service.client = mock_client
+        yield note_analysis_service
+        note_analysis_service.openai_enabled = False
+        note_analysis_service.client = None
 
     # --- Initialization Tests ---
 
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_init_openai_enabled(self, mock_settings, mock_openai_class):
-        """Test initialization when OpenAI is configured and enabled."""
-        # Configure mock settings
-        mock_settings.OPENAI_API_KEY = "fake_api_key"
-        mock_settings.ENABLE_AI_FEATURES = True
+    @pytest.mark.parametrize("api_key,ai_features,enabled", [
+        ("fake_api_key", True, True),
+        (None, True, False), # API key missing
+        ("fake_api_key", False, False), # AI features disabled via settings
+    ], ids=["openai_enabled", "disabled_no_key", "disabled_feature_flag"])
+    def test_init_openai(self, fake_settings, fake_openai, mock_client, api_key, ai_features, enabled):
+        """Test initialization enables OpenAI only with a key and the feature flag on."""
+        fake_settings.OPENAI_API_KEY = api_key
+        fake_settings.ENABLE_AI_FEATURES = ai_features
 
-        # Mock OpenAI client instance
-        mock_openai_instance = MagicMock()
-        mock_openai_class.return_value = mock_openai_instance
-
-        # Initialize service
-        service = NoteAnalysisService()
-
-        # Assertions
-        self.assertTrue(service.openai_enabled)
-        self.assertIsNotNone(service.client)
-        self.assertEqual(service.client, mock_openai_instance)
-        mock_openai_class.assert_called_once_with(api_key="fake_api_key")
-        # print(f"Debug: service.client type: {type(service.client)}") # For debugging
-
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_init_openai_disabled_no_key(self, mock_settings, mock_openai_class):
-        """Test initialization when OpenAI API key is missing."""
-        # Configure mock settings
-        mock_settings.OPENAI_API_KEY = None # Or ""
-        mock_settings.ENABLE_AI_FEATURES = True
-
-        # Initialize service
         service = NoteAnalysisService()
 
-        # Assertions
-        self.assertFalse(service.openai_enabled)
-        self.assertIsNone(service.client)
-        mock_openai_class.assert_not_called() # OpenAI() constructor should not be called
-
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_init_openai_disabled_feature_flag(self, mock_settings, mock_openai_class):
-        """Test initialization when AI features are disabled via settings."""
-         # Configure mock settings
-        mock_settings.OPENAI_API_KEY = "fake_api_key"
-        mock_settings.ENABLE_AI_FEATURES = False
-
-        # Initialize service
-        service = NoteAnalysisService()
-
-        # Assertions
-        self.assertFalse(service.openai_enabled)
-        self.assertIsNone(service.client)
-        mock_openai_class.assert_not_called() # OpenAI() constructor should not be called
+        assert service.openai_enabled is enabled
+        assert service.client is (mock_client if enabled else None)
+        # OpenAI() constructor should only be called when enabled
+        assert fake_openai.calls == ([{"api_key": api_key}] if enabled else [])
 
     # --- analyze_note Tests ---
 
-    @patch('app.services.note_analysis.settings')
-    def test_analyze_note_openai_disabled(self, mock_settings):
-        """Test analyze_note when OpenAI is disabled."""
-        mock_settings.OPENAI_API_KEY = None
-        mock_settings.ENABLE_AI_FEATURES = True
-        service = NoteAnalysisService() # Re-init with new settings
-
-        result = service.analyze_note(self.test_title, self.test_content_long)
-
-        expected_result = {
-            "summary": None,
-            "sentiment": "Neutral",
-            "analysis_method": "none"
-        }
-        self.assertEqual(result, expected_result)
-
-    @patch('app.services.note_analysis.settings')
-    def test_analyze_note_content_too_short(self, mock_settings):
-        """Test analyze_note with content that is too short."""
-        mock_settings.OPENAI_API_KEY = "fake_api_key"
-        mock_settings.ENABLE_AI_FEATURES = True
-        service = NoteAnalysisService() # Re-init
-
-        result = service.analyze_note(self.test_title, self.test_content_short)
-
-        expected_result = {
-            "summary": None,
-            "sentiment": "Neutral",
-            "analysis_method": "none"
-        }
-        self.assertEqual(result, expected_result)
-
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_analyze_note_openai_enabled_success(self, mock_settings, mock_openai_class):
-        """Test analyze_note success path with OpenAI enabled."""
-        mock_settings.OPENAI_API_KEY = "fake_api_key"
-        mock_settings.ENABLE_AI_FEATURES = True
+    @pytest.mark.parametrize("openai_enabled,content,openai_reply,expected_sentiment,expected_method", [
+        (False, TEST_CONTENT_LONG, None, "Neutral", "none"),
+        (True, TEST_CONTENT_SHORT, None, "Neutral", "none"), # Content too short to analyze
+        (True, TEST_CONTENT_LONG, "Positive", "Positive", "openai"),
+        # analyze_sentiment swallows the API error and falls back to Neutral
+        (True, TEST_CONTENT_LONG, Exception("API Error"), "Neutral", "openai"),
+    ], ids=["openai_disabled", "content_too_short", "openai_enabled_success", "openai_exception"])
+    def test_analyze_note(self, service, mock_client, openai_response_factory, openai_enabled, content, openai_reply, expected_sentiment, expected_method):
+        """Test analyze_note across OpenAI availability, content length and API outcomes."""
+        service.openai_enabled = openai_enabled
+        if isinstance(openai_reply, Exception):
+            mock_client.chat.completions.create.side_effect = openai_reply
+        elif openai_reply is not None:
+            mock_client.chat.completions.create.return_value = openai_response_factory(openai_reply)
+
+        result = service.analyze_note(TEST_TITLE, content)
 
-        # Mock the client and its methods
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_client.chat.completions.create.return_value = create_mock_openai_response("Positive")
-
-        service = NoteAnalysisService()
-
-        # Mock analyze_sentiment directly for this test (alternative to mocking client.chat...)
-        # This isolates analyze_note logic better if analyze_sentiment is complex
-        with patch.object(service, 'analyze_sentiment', return_value="Positive") as mock_analyze_sentiment:
-             result = service.analyze_note(self.test_title, self.test_content_long)
-
-             expected_result = {
-                 "summary": None, # Summary is not generated by analyze_note
-                 "sentiment": "Positive",
-                 "analysis_method": "openai"
-             }
-             self.assertEqual(result, expected_result)
-             mock_analyze_sentiment.assert_called_once_with(self.test_content_long)
-
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_analyze_note_openai_exception(self, mock_settings, mock_openai_class):
-        """Test analyze_note when OpenAI call raises an exception."""
-        mock_settings.OPENAI_API_KEY = "fake_api_key"
-        mock_settings.ENABLE_AI_FEATURES = True
-
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        # Make analyze_sentiment (which calls the client) raise an error
-        mock_client.chat.completions.create.side_effect = Exception("API Error")
-
-        service = NoteAnalysisService()
-
-        result = service.analyze_note(self.test_title, self.test_content_long)
-
-        # Should fallback to default on error
         expected_result = {
-            "summary":None,
-            "sentiment": "Neutral", # Falls back from analyze_sentiment exception
-            "analysis_method": "openai" # Falls back because the try block failed
+            "summary": None, # Summary is not generated by analyze_note
+            "sentiment": expected_sentiment,
+            "analysis_method": expected_method
         }
-        self.assertEqual(result, expected_result)
+        assert result == expected_result
+        # The API is only reached for long content with OpenAI enabled
+        assert mock_client.chat.completions.create.called is (expected_method == "openai")
 
 
     # --- analyze_sentiment Tests ---
 
-    @patch('app.services.note_analysis.settings')
-    def test_analyze_sentiment_openai_disabled(self, mock_settings):
+    def test_analyze_sentiment_openai_disabled(self, note_analysis_service_disabled):
         """Test analyze_sentiment when OpenAI is disabled."""
-        mock_settings.OPENAI_API_KEY = None
-        mock_settings.ENABLE_AI_FEATURES = True
-        service = NoteAnalysisService()
-
-        sentiment = service.analyze_sentiment(self.test_content_long)
-        self.assertEqual(sentiment, "Neutral")
-
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_analyze_sentiment_positive(self, mock_settings, mock_openai_class):
-        """Test analyze_sentiment returns Positive."""
-        mock_settings.OPENAI_API_KEY = "fake_key"
-        mock_settings.ENABLE_AI_FEATURES = True
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_client.chat.completions.create.return_value = create_mock_openai_response("Positive")
-
-        service = NoteAnalysisService()
-        sentiment = service.analyze_sentiment(self.test_content_long)
-
-        self.assertEqual(sentiment, "Positive")
-        mock_client.chat.completions.create.assert_called_once()
+        sentiment = note_analysis_service_disabled.analyze_sentiment(TEST_CONTENT_LONG)
+        assert sentiment == "Neutral"
+
+    @pytest.mark.parametrize("openai_reply,expected", [
+        ("Positive", "Positive"),
+        ("The sentiment is clearly nEgAtIvE.", "Negative"), # Mixed case and extra text
+        ("I'm unsure about the sentiment.", "Neutral"), # Fallback on unexpected response
+        (Exception("API Down"), "Neutral"), # Fallback on exception
+    ], ids=["positive", "mixed_case_response", "unexpected_response", "api_error"])
+    def test_analyze_sentiment(self, service, mock_client, openai_response_factory, openai_reply, expected):
+        """Test analyze_sentiment maps OpenAI replies and errors to a sentiment category."""
+        if isinstance(openai_reply, Exception):
+            mock_client.chat.completions.create.side_effect = openai_reply
+        else:
+            mock_client.chat.completions.create.return_value = openai_response_factory(openai_reply)
+
+        sentiment = service.analyze_sentiment(TEST_CONTENT_LONG)
+
+        assert sentiment == expected
         call_args = mock_client.chat.completions.create.call_args
-        self.assertEqual(call_args.kwargs['model'], 'gpt-4o')
-        self.assertIn("Positive, Neutral, Mixed or Negative", call_args.kwargs['messages'][1]['content'])
-
-
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_analyze_sentiment_mixed_case_response(self, mock_settings, mock_openai_class):
-        """Test analyze_sentiment handles mixed case and extra text."""
-        mock_settings.OPENAI_API_KEY = "fake_key"
-        mock_settings.ENABLE_AI_FEATURES = True
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_client.chat.completions.create.return_value = create_mock_openai_response("The sentiment is clearly nEgAtIvE.")
-
-        service = NoteAnalysisService()
-        sentiment = service.analyze_sentiment(self.test_content_long)
-
-        self.assertEqual(sentiment, "Negative") # Should match Negative category
-
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_analyze_sentiment_unexpected_response(self, mock_settings, mock_openai_class):
-        """Test analyze_sentiment falls back to Neutral on unexpected response."""
-        mock_settings.OPENAI_API_KEY = "fake_key"
-        mock_settings.ENABLE_AI_FEATURES = True
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_client.chat.completions.create.return_value = create_mock_openai_response("I'm unsure about the sentiment.")
-
-        service = NoteAnalysisService()
-        sentiment = service.analyze_sentiment(self.test_content_long)
-
-        self.assertEqual(sentiment, "Neutral") # Fallback
-
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_analyze_sentiment_api_error(self, mock_settings, mock_openai_class):
-        """Test analyze_sentiment falls back to Neutral on API error."""
-        mock_settings.OPENAI_API_KEY = "fake_key"
-        mock_settings.ENABLE_AI_FEATURES = True
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_client.chat.completions.create.side_effect = Exception("API Down")
-
-        service = NoteAnalysisService()
-        sentiment = service.analyze_sentiment(self.test_content_long)
-
-        self.assertEqual(sentiment, "Neutral") # Fallback on exception
+        assert call_args.kwargs['model'] == 'gpt-4o'
+        assert "Positive, Neutral, Mixed or Negative" in call_args.kwargs['messages'][1]['content']
 
 
     # --- generate_openai_summary Tests ---
 
-    @patch('app.services.note_analysis.settings')
-    def test_generate_summary_openai_disabled(self, mock_settings):
-        """Test generate_summary when OpenAI is disabled."""
-        mock_settings.OPENAI_API_KEY = None
-        mock_settings.ENABLE_AI_FEATURES = True
-        service = NoteAnalysisService()
-
-        result = service.generate_openai_summary(self.test_title, self.test_content_long)
-
-        self.assertFalse(result["success"])
-        self.assertEqual(result["error"], "OpenAI API key not configured")
-        self.assertIsNone(result["summary"])
-
-    @patch('app.services.note_analysis.settings')
-    def test_generate_summary_no_content(self, mock_settings):
-        """Test generate_summary with empty content."""
-        mock_settings.OPENAI_API_KEY = "fake_key"
-        mock_settings.ENABLE_AI_FEATURES = True
-        service = NoteAnalysisService()
-
-        result = service.generate_openai_summary(self.test_title, self.test_content_empty)
-
-        self.assertFalse(result["success"])
-        self.assertEqual(result["error"], "No content provided")
-        self.assertIsNone(result["summary"])
-
-    @patch('app.services.note_analysis.settings')
-    def test_generate_summary_content_too_short(self, mock_settings):
-        """Test generate_summary with content too short (based on word count < 20)."""
-        mock_settings.OPENAI_API_KEY = "fake_key"
-        mock_settings.ENABLE_AI_FEATURES = True
-        service = NoteAnalysisService()
-        # Create content with 19 words
-        short_content = "word " * 19
-
-        result = service.generate_openai_summary(self.test_title, short_content)
-
-        self.assertFalse(result["success"])
-        # Check the error message matches the code's logic, even if description differs
-        self.assertEqual(result["error"], "Content is less than 200 words and doesn't need summarization") # Message text comes from code
-        self.assertIsNone(result["summary"])
-
-
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_generate_summary_success_default_model(self, mock_settings, mock_openai_class):
-        """Test successful summary generation with default model."""
-        mock_settings.OPENAI_API_KEY = "fake_key"
-        mock_settings.ENABLE_AI_FEATURES = True
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
+    @pytest.mark.parametrize("openai_enabled,content,expected_error", [
+        (False, TEST_CONTENT_LONG, "OpenAI API key not configured"),
+        (True, TEST_CONTENT_EMPTY, "No content provided"),
+        # 19 words; the message text comes from the code, even though the check is on word count < 20
+        (True, "word " * 19, "Content is less than 200 words and doesn't need summarization"),
+    ], ids=["openai_disabled", "no_content", "content_too_short"])
+    def test_generate_summary_rejected(self, service, mock_client, openai_enabled, content, expected_error):
+        """Test generate_summary returns an error without calling OpenAI."""
+        service.openai_enabled = openai_enabled
+
+        result = service.generate_openai_summary(TEST_TITLE, content)
+
+        assert result["success"] is False
+        assert result["error"] == expected_error
+        assert result["summary"] is None
+        mock_client.chat.completions.create.assert_not_called()
+
+
+    @pytest.mark.parametrize("summary_kwargs,expected_model,expected_length_hint", [
+        ({}, "gpt-4o", "under 150 characters"), # Default model and max_length
+        ({"max_length": 50, "model": "gpt-3.5-turbo"}, "gpt-3.5-turbo", "under 50 characters"),
+        ({"model": "gpt-4o"}, "gpt-4o", "under 150 characters"),
+    ], ids=["default_model", "specific_model_and_length", "explicit_gpt4o"])
+    def test_generate_summary_success(self, service, mock_client, openai_response_factory, summary_kwargs, expected_model, expected_length_hint):
+        """Test successful summary generation across model and length options."""
         mock_summary = "This is the generated summary."
-        mock_client.chat.completions.create.return_value = create_mock_openai_response(mock_summary)
+        mock_client.chat.completions.create.return_value = openai_response_factory(mock_summary)
 
-        service = NoteAnalysisService()
-        result = service.generate_openai_summary(self.test_title, self.test_content_long)
-
-        self.assertTrue(result["success"])
-        self.assertEqual(result["summary"], mock_summary)
-        self.assertEqual(result["model_used"], "gpt-4o") # Default model
-        self.assertIsNone(result["error"])
-        mock_client.chat.completions.create.assert_called_once()
-        call_args = mock_client.chat.completions.create.call_args
-        self.assertEqual(call_args.kwargs['model'], 'gpt-4o')
-        self.assertIn(self.test_title, call_args.kwargs['messages'][1]['content'])
-        self.assertIn(self.test_content_long, call_args.kwargs['messages'][1]['content'])
-        self.assertIn("under 150 characters", call_args.kwargs['messages'][1]['content']) # Default max_length
-
-
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_generate_summary_success_specific_model_and_length(self, mock_settings, mock_openai_class):
-        """Test successful summary generation with specific model and length."""
-        mock_settings.OPENAI_API_KEY = "fake_key"
-        mock_settings.ENABLE_AI_FEATURES = True
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_summary = "Short summary."
-        mock_client.chat.completions.create.return_value = create_mock_openai_response(mock_summary)
+        result = service.generate_openai_summary(TEST_TITLE, TEST_CONTENT_LONG, **summary_kwargs)
 
-        service = NoteAnalysisService()
-        result = service.generate_openai_summary(
-            self.test_title,
-            self.test_content_long,
-            max_length=50,
-            model="gpt-3.5-turbo"
-        )
-
-        self.assertTrue(result["success"])
-        self.assertEqual(result["summary"], mock_summary)
-        self.assertEqual(result["model_used"], "gpt-3.5-turbo")
-        self.assertIsNone(result["error"])
-        mock_client.chat.completions.create.assert_called_once()
+        assert result["success"] is True
+        assert result["summary"] == mock_summary
+        assert result["model_used"] == expected_model
+        assert result["error"] is None
         call_args = mock_client.chat.completions.create.call_args
-        self.assertEqual(call_args.kwargs['model'], 'gpt-3.5-turbo')
-        self.assertIn("under 50 characters", call_args.kwargs['messages'][1]['content'])
+        assert call_args.kwargs['model'] == expected_model # Check model used in API call
+        assert TEST_TITLE in call_args.kwargs['messages'][1]['content']
+        assert TEST_CONTENT_LONG in call_args.kwargs['messages'][1]['content']
+        assert expected_length_hint in call_args.kwargs['messages'][1]['content']
 
 
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_generate_summary_invalid_model_defaults_to_gpt4o(self, mock_settings, mock_openai_class):
-        """Test summary generation defaults to gpt-4o if invalid model specified."""
-        mock_settings.OPENAI_API_KEY = "fake_key"
-        mock_settings.ENABLE_AI_FEATURES = True
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_summary = "Summary from default model."
-        mock_client.chat.completions.create.return_value = create_mock_openai_response(mock_summary)
-
-        service = NoteAnalysisService()
-        result = service.generate_openai_summary(
-            self.test_title,
-            self.test_content_long,
-            model="gpt-4o" 
-        )
-
-        self.assertTrue(result["success"])
-        self.assertEqual(result["summary"], mock_summary)
-        self.assertEqual(result["model_used"], "gpt-4o") # Should default
-        self.assertIsNone(result["error"])
-        mock_client.chat.completions.create.assert_called_once()
-        call_args = mock_client.chat.completions.create.call_args
-        self.assertEqual(call_args.kwargs['model'], 'gpt-4o') # Check model used in API call
-
-
-    @patch('app.services.note_analysis.OpenAI')
-    @patch('app.services.note_analysis.settings')
-    def test_generate_summary_api_error(self, mock_settings, mock_openai_class):
+    def test_generate_summary_api_error(self, service, mock_client):
         """Test generate_summary handles API errors."""
-        mock_settings.OPENAI_API_KEY = "fake_key"
-        mock_settings.ENABLE_AI_FEATURES = True
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
         error_message = "Network connection failed"
         mock_client.chat.completions.create.side_effect = Exception(error_message)
 
-        service = NoteAnalysisService()
-        result = service.generate_openai_summary(self.test_title, self.test_content_long)
-
-        self.assertFalse(result["success"])
-        self.assertIsNone(result["summary"])
-        self.assertEqual(result["error"], error_message)
-        self.assertEqual(result["model_used"], "gpt-4o") # Still records the intended model
-
+        result = service.generate_openai_summary(TEST_TITLE, TEST_CONTENT_LONG)
 
-if __name__ == '__main__':
-    unittest.main(argv=['first-arg-is-ignored'], exit=False)
\ No newline at end of file
+        assert result["success"] is False
+        assert result["summary"] is None
+        assert result["error"] == error_message
+        assert result["model_used"] == "gpt-4o" # Still records the intended model
@@ -1,54 +1,74 @@
 """Helper utilities for mocking MongoDB in tests"""
-import pytest
-from unittest.mock import MagicMock, patch
-from bson.objectid import ObjectId
+from unittest.mock import MagicMock, create_autospec
+
+class FakeCursor:
+    """Plain stand-in for a pymongo cursor; chaining methods return the cursor itself
+    
+    Each chaining call is recorded in calls as a (method, args) pair, in order.
+    """
+    __slots__ = ("items", "calls")
+
+    def __init__(self, items=None):
+        self.items = list(items) if items is not None else []
+        self.calls = []
+
+    def sort(self, *args):
+        self.calls.append(("sort", args))
+        return self
+
+    def skip(self, *args):
+        self.calls.append(("skip", args))
+        return self
+
+    def limit(self, *args):
+        self.calls.append(("limit", args))
+        return self
+
+    def batch_size(self, *args):
+        self.calls.append(("batch_size", args))
+        return self
+
+    def __iter__(self):
+        return iter(self.items)
 
 class MockMongoDB:
     """Mock MongoDB utilities for testing"""
     
     @staticmethod
     def mock_collection():
-        """Create a mock MongoDB collection"""
-        mock_coll = MagicMock()
-        
-        # Setup commonly used methods
-        mock_cursor = MagicMock()
-        mock_cursor.sort.return_value = mock_cursor
-        mock_cursor.skip.return_value = mock_cursor
-        mock_cursor.limit.return_value = []
-        
+        """Create a mock MongoDB collection specced against pymongo's Collection"""
+        # Imported here so loading the helper doesn't pull in pymongo/bson
+        from pymongo.collection import Collection
+
+        # Building the spec walks the whole Collection API, so fixtures should
+        # reuse one instance (see session_mongodb_collection in conftest) rather than rebuild it
+        mock_coll = create_autospec(Collection, instance=True)
+        mock_cursor = FakeCursor()
+        MockMongoDB.seed_collection(mock_coll, mock_cursor)
+        return mock_coll, mock_cursor
+
+    @staticmethod
+    def seed_collection(mock_coll, mock_cursor):
+        """Apply the default return values for commonly used methods"""
+        from bson.objectid import ObjectId
+
+        MockMongoDB.configure_cursor(mock_cursor, [])
         mock_coll.find.return_value = mock_cursor
         mock_coll.find_one.return_value = None
         mock_coll.insert_one.return_value = MagicMock(inserted_id=ObjectId())
         mock_coll.update_one.return_value = MagicMock(modified_count=1)
         mock_coll.delete_one.return_value = MagicMock(deleted_count=1)
         mock_coll.count_documents.return_value = 0
-        
-        return mock_coll, mock_cursor
-    
+
     @staticmethod
-    def create_mock_get_collection():
-        """Create a patched version of the get_collection function"""
-        mock_coll, mock_cursor = MockMongoDB.mock_collection()
-        
-        def side_effect(collection_name):
-            return mock_coll
-            
-        mock_get_collection = MagicMock(side_effect=side_effect)
-        
-        return mock_get_collection, mock_coll, mock_cursor
-
-@pytest.fixture
-def mock_mongodb_collection():
-    """Fixture that returns a mock MongoDB collection"""
-    mock_coll, mock_cursor = MockMongoDB.mock_collection()
-    return mock_coll, mock_cursor
-
-@pytest.fixture
-def patched_get_collection():
-    """Fixture that patches mongodb.get_collection"""
-    mock_get_collection, mock_coll, mock_cursor = MockMongoDB.create_mock_get_collection()
-    
-    with patch('app.db.mongodb.get_collection', 
-              side_effect=mock_get_collection) as patched:
-        yield patched, mock_coll, mock_cursor
\ No newline at end of file
+    def configure_cursor(mock_cursor, docs):
+        """Set the documents a find() chain yields and clear the recorded chaining calls"""
+        mock_cursor.items = list(docs)
+        mock_cursor.calls = []
+        return mock_cursor
+
+    @staticmethod
+    def reset_collection(mock_coll, mock_cursor):
+        """Clear calls and configuration left by a previous test, then re-seed defaults"""
+        mock_coll.reset_mock(return_value=True, side_effect=True)
+        MockMongoDB.seed_collection(mock_coll, mock_cursor)
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import argparse
 import os
-import uvicorn
 
 def main():
     """Run the API server"""
@@ -21,6 +20,13 @@ def main():
         init_mongodb()
         print("Database initialization complete.")
     
+    # Skip .pyc writes in the reloader's worker processes during development
+    if args.reload:
+        os.environ.setdefault("PYTHONDONTWRITEBYTECODE", "1")
+    
+    # Imported here so --help doesn't pay for loading the server stack
+    import uvicorn
+    
     # Run the server
     uvicorn.run(
         "app.main:app",
@@ -12,7 +12,7 @@ if [ ! -d "venv" ]; then
     
     # Install dependencies
     echo "Installing dependencies..."
-    pip install -r requirements.txt
+    pip install --prefer-binary --disable-pip-version-check -r requirements.txt
     
 else
     # Activate virtual environment